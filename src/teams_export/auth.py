@@ -1,18 +1,21 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Callable, Optional
-
-import msal
+from typing import TYPE_CHECKING, Callable, Optional
 
 from .config import AppConfig, ensure_config_dir
 
+if TYPE_CHECKING:
+    import msal
+
 
 class AuthError(RuntimeError):
     """Raised when authentication fails."""
 
 
 def _load_cache(path: Path) -> msal.SerializableTokenCache:
+    import msal
+
     cache = msal.SerializableTokenCache()
     if path.exists():
         cache.deserialize(path.read_text(encoding="utf-8"))
@@ -33,6 +36,10 @@ def acquire_token(
 ) -> str:
     """Authenticate the user and return an access token."""
 
+    # msal is slow to import and only needed once we actually authenticate,
+    # so --help and config/date errors don't pay for it.
+    import msal
+
     ensure_config_dir()
     cache = _load_cache(config.token_cache_path)
     app = msal.PublicClientApplication(
@@ -8,8 +8,8 @@ import typer
 from .auth import AuthError, acquire_token
 from .config import ConfigError, load_config
 from .dates import DateParseError, resolve_range
-from .exporter import ChatNotFoundError, choose_chat, export_chat
-from .graph import GraphClient
+from .exporter import ChatNotFoundError, choose_chat, export_chats
+from .graph import DEFAULT_MAX_WORKERS, GraphClient
 
 app = typer.Typer(
     add_completion=False,
@@ -19,32 +19,38 @@ app = typer.Typer(
     ),
 )
 
+LIST_HEADER = "Chat ID\tType\tTitle\tParticipants"
 
-def _chat_title(chat: dict) -> str:
+
+def _member_display_labels(chat: dict) -> list[str | None]:
+    return [m.get("displayName") or m.get("email") for m in chat.get("members", [])]
+
+
+def _chat_title(chat: dict, labels: list[str | None] | None = None) -> str:
     title = chat.get("topic") or chat.get("displayName")
     if title:
         return title
-    members = chat.get("members", [])
-    if members:
-        return ", ".join(m.get("displayName") or m.get("email") or "?" for m in members)
+    if labels is None:
+        labels = _member_display_labels(chat)
+    if labels:
+        return ", ".join(label or "?" for label in labels)
     return chat.get("id", "<unknown chat>")
 
 
-def _participants(chat: dict) -> str:
-    members = chat.get("members", [])
-    labels = []
-    for member in members:
-        label = member.get("displayName") or member.get("email")
-        if label:
-            labels.append(label)
-    return ", ".join(labels)
+def _participants(labels: list[str | None]) -> str:
+    return ", ".join(label for label in labels if label)
 
 
 def _print_chat_list(chats: Iterable[dict]) -> None:
+    lines = [LIST_HEADER]
     for chat in chats:
-        typer.echo(
-            f"{chat.get('id')}\t{chat.get('chatType')}\t{_chat_title(chat)}\t{_participants(chat)}"
+        # Title and participants both come from the member list; walk it once.
+        labels = _member_display_labels(chat)
+        lines.append(
+            f"{chat.get('id')}\t{chat.get('chatType')}\t{_chat_title(chat, labels)}\t{_participants(labels)}"
         )
+    # One write for the whole table rather than one per chat.
+    typer.echo("\n".join(lines))
 
 
 @app.command()
@@ -101,6 +107,13 @@ def main(
         "--force-login",
         help="Skip cache and refresh the device login flow.",
     ),
+    workers: int = typer.Option(
+        DEFAULT_MAX_WORKERS,
+        "--workers",
+        min=1,
+        show_default=True,
+        help="Number of chats to fetch concurrently.",
+    ),
 ) -> None:
     try:
         config = load_config()
@@ -121,15 +134,15 @@ def main(
         typer.secho(f"Authentication failed: {exc}", fg=typer.colors.RED)
         raise typer.Exit(code=3)
 
-    with GraphClient(token) as client:
-        chats = client.list_chats()
+    with GraphClient(token, max_workers=workers) as client:
+        # A lone --chat is matched on the chat topic, so membership is only
+        # needed for listing, --all filenames, participant lookups or prompting.
+        need_members = list_chats or export_all or bool(participant) or not chat_name
+        chats = list(client.list_chats(expand_members=need_members))
         if list_chats:
-            typer.echo("Chat ID\tType\tTitle\tParticipants")
             _print_chat_list(chats)
             raise typer.Exit()
 
-        exports: list[tuple[str, Path, int]] = []
-
         if export_all:
             selected_chats = chats
         else:
@@ -147,27 +160,26 @@ def main(
             selected_chats = [chat]
 
         total_messages = 0
-        for chat in selected_chats:
-            title = _chat_title(chat)
-            typer.echo(f"Exporting chat: {title}")
-            try:
-                output_path, count = export_chat(
-                    client,
-                    chat,
-                    start_dt,
-                    end_dt,
-                    output_dir=output_dir,
-                    output_format=output_format,
-                )
-            except ValueError as exc:
-                typer.secho(str(exc), fg=typer.colors.RED)
-                raise typer.Exit(code=5)
-
-            exports.append((title, output_path, count))
-            total_messages += count
-
-    for title, path, count in exports:
-        typer.echo(f"Exported {count} messages from {title}; saved to {path}")
+        if len(selected_chats) == 1:
+            typer.echo(f"Exporting chat: {_chat_title(selected_chats[0])}")
+        else:
+            typer.echo(f"Exporting {len(selected_chats)} chats…")
+        try:
+            # Report each chat as soon as its file is written, so long --all runs
+            # show progress and a failure part-way still lists finished exports.
+            for chat, output_path, count in export_chats(
+                client,
+                selected_chats,
+                start_dt,
+                end_dt,
+                output_dir=output_dir,
+                output_format=output_format,
+            ):
+                typer.echo(f"Exported {count} messages from {_chat_title(chat)}; saved to {output_path}")
+                total_messages += count
+        except ValueError as exc:
+            typer.secho(str(exc), fg=typer.colors.RED)
+            raise typer.Exit(code=5)
 
     typer.echo(
         f"✅ Export complete. Total messages: {total_messages}. Date range: {start_dt.date()} to {end_dt.date()}"
@@ -1,22 +1,34 @@
 from __future__ import annotations
 
 import csv
+import datetime as dt
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Callable, Iterable, Iterator, List, Sequence
 
 from dateutil import parser
 
+from .dates import to_iso
 from .graph import GraphClient
 
+WRITE_BUFFER_SIZE = 1 << 20
+
+CSV_FIELDNAMES = ("timestamp", "sender", "sender_email", "content", "type")
+
+_UNSAFE_FILENAME_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+
 
 class ChatNotFoundError(RuntimeError):
     """Raised when a chat matching the requested criteria cannot be found."""
 
 
 def _normalise(value: str | None) -> str:
-    return re.sub(r"\s+", " ", value or "").strip().lower()
+    # str.split() treats exactly the characters matched by \s as whitespace,
+    # so this collapses and trims like re.sub(r"\s+", " ") without the regex.
+    # casefold() rather than lower() so e.g. "Straße" matches "STRASSE".
+    return " ".join((value or "").split()).casefold()
 
 
 def _member_labels(chat: dict) -> List[str]:
@@ -46,11 +58,11 @@ def choose_chat(
 
     for chat in chats:
         chat_type = chat.get("chatType")
-        topic = chat.get("topic") or chat.get("displayName")
-        chat_label = _normalise(topic)
-        if name_norm and chat_label == name_norm:
-            matches.append(chat)
-            continue
+        if name_norm:
+            topic = chat.get("topic") or chat.get("displayName")
+            if _normalise(topic) == name_norm:
+                matches.append(chat)
+                continue
         if participant_norm:
             if chat_type and chat_type.lower() != "oneonone":
                 continue
@@ -73,13 +85,15 @@ def choose_chat(
 
 
 def _normalise_filename(identifier: str) -> str:
-    safe = re.sub(r"[^a-zA-Z0-9_-]+", "_", identifier.strip())
+    safe = _UNSAFE_FILENAME_RE.sub("_", identifier.strip())
     return safe.lower().strip("_") or "chat"
 
 
 def _transform_message(message: dict) -> dict:
-    sender_info = message.get("from", {}).get("user", {})
-    sender_fallback = message.get("from", {}).get("application", {})
+    sender = message.get("from") or {}
+    body = message.get("body") or {}
+    sender_info = sender.get("user") or {}
+    sender_fallback = sender.get("application") or {}
     sender_display = sender_info.get("displayName") or sender_fallback.get("displayName")
     sender_email = sender_info.get("userPrincipalName") or sender_info.get("email")
 
@@ -92,8 +106,8 @@ def _transform_message(message: dict) -> dict:
         "timestamp": timestamp,
         "type": message.get("messageType"),
         "subject": message.get("subject"),
-        "content_type": message.get("body", {}).get("contentType"),
-        "content": message.get("body", {}).get("content"),
+        "content_type": body.get("contentType"),
+        "content": body.get("content"),
         "reactions": message.get("reactions", []),
         "mentions": message.get("mentions", []),
         "attachments": message.get("attachments", []),
@@ -101,6 +115,22 @@ def _transform_message(message: dict) -> dict:
     return transformed
 
 
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> dt.datetime | None:
+    """Parse a Graph ISO 8601 timestamp, returning ``None`` when malformed."""
+
+    # Each message is checked by both the pagination stop condition and the
+    # range filter, usually with the same string, hence the cache.
+    try:
+        return dt.datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        pass
+    try:
+        return parser.isoparse(value)
+    except (ValueError, TypeError):
+        return None
+
+
 def _within_range(message: dict, start_dt, end_dt) -> bool:
     timestamp = (
         message.get("lastModifiedDateTime")
@@ -109,44 +139,61 @@ def _within_range(message: dict, start_dt, end_dt) -> bool:
     )
     if not timestamp:
         return False
-    try:
-        dt_value = parser.isoparse(timestamp)
-    except (ValueError, TypeError):
+    dt_value = _parse_timestamp(timestamp)
+    if dt_value is None:
         return False
     return start_dt <= dt_value <= end_dt
 
 
-def _write_json(messages: Sequence[dict], output_path: Path) -> None:
-    payload = list(messages)
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+def _write_json(messages: Iterable[dict], output_path: Path) -> None:
+    # Stream one message at a time instead of materialising the whole document.
+    # JSON strings never contain raw newlines, so re-indenting by line matches
+    # json.dumps(list, indent=2) byte for byte.
+    with output_path.open("w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as handle:
+        separator = "[\n  "
+        for message in messages:
+            handle.write(separator)
+            handle.write(json.dumps(message, indent=2).replace("\n", "\n  "))
+            separator = ",\n  "
+        handle.write("[]" if separator == "[\n  " else "\n]")
+
+
+def _write_csv(messages: Iterable[dict], output_path: Path) -> None:
+    with output_path.open(
+        "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE
+    ) as handle:
+        # extrasaction="ignore" lets DictWriter project each message onto the
+        # CSV columns itself, without building an intermediate dict per row.
+        writer = csv.DictWriter(handle, fieldnames=CSV_FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(messages)
 
 
-def _write_csv(messages: Sequence[dict], output_path: Path) -> None:
-    fieldnames = ["timestamp", "sender", "sender_email", "content", "type"]
-    with output_path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        for message in messages:
-            writer.writerow({key: message.get(key) for key in fieldnames})
+_WRITERS: dict[str, Callable[[Iterable[dict], Path], None]] = {
+    "json": _write_json,
+    "csv": _write_csv,
+}
 
 
-def export_chat(
-    client: GraphClient,
-    chat: dict,
-    start_dt,
-    end_dt,
-    *,
-    output_dir: Path,
-    output_format: str = "json",
-) -> tuple[Path, int]:
+def _writer_for(output_format: str) -> Callable[[Iterable[dict], Path], None]:
+    writer = _WRITERS.get(output_format.lower())
+    if writer is None:
+        raise ValueError("Unsupported export format. Choose json or csv.")
+    return writer
+
+
+def _chat_id(chat: dict) -> str:
     chat_id = chat.get("id")
     if not chat_id:
         raise ChatNotFoundError("Selected chat missing identifier.")
+    return chat_id
+
 
+def _output_path(chat: dict, start_dt, end_dt, output_dir: Path, output_format: str) -> Path:
     identifier = chat.get("topic") or chat.get("displayName")
     if not identifier:
         members = _member_labels(chat)
-        identifier = members[0] if members else chat_id
+        identifier = members[0] if members else chat.get("id")
     filename_stem = _normalise_filename(identifier)
     output_dir.mkdir(parents=True, exist_ok=True)
     suffix = output_format.lower()
@@ -154,28 +201,119 @@ def export_chat(
         date_fragment = start_dt.date().isoformat()
     else:
         date_fragment = f"{start_dt.date()}_{end_dt.date()}"
-    output_path = output_dir / f"{filename_stem}_{date_fragment}.{suffix}"
+    return output_dir / f"{filename_stem}_{date_fragment}.{suffix}"
+
+
+def _graph_window(start_dt, end_dt) -> dict[str, str]:
+    # Graph only filters with exclusive gt/lt, so widen by a second on each
+    # side and let _within_range apply the exact inclusive bounds.
+    return {
+        "start_iso": to_iso(start_dt - dt.timedelta(seconds=1)),
+        "end_iso": to_iso(end_dt + dt.timedelta(seconds=1)),
+    }
+
 
+def _stop_condition_for(start_dt) -> Callable[[dict], bool]:
+    # Messages arrive newest-modified first, so key off the same field.
     def _stop_condition(message: dict) -> bool:
-        ts_value = message.get("createdDateTime") or message.get("lastModifiedDateTime")
+        ts_value = message.get("lastModifiedDateTime") or message.get("createdDateTime")
         if not ts_value:
             return False
-        try:
-            dt_value = parser.isoparse(ts_value)
-        except (ValueError, TypeError):
-            return False
-        return dt_value < start_dt
+        dt_value = _parse_timestamp(ts_value)
+        return dt_value is not None and dt_value < start_dt
 
-    raw_messages = client.list_chat_messages(chat_id, stop_condition=_stop_condition)
-    filtered_messages = [m for m in raw_messages if _within_range(m, start_dt, end_dt)]
-    messages = [_transform_message(m) for m in filtered_messages]
-    message_count = len(messages)
+    return _stop_condition
+
+
+def _write_messages(
+    raw_messages: Iterable[dict],
+    start_dt,
+    end_dt,
+    output_path: Path,
+    writer: Callable[[Iterable[dict], Path], None],
+) -> int:
+    count = 0
+
+    def _selected() -> Iterator[dict]:
+        nonlocal count
+        for message in raw_messages:
+            if _within_range(message, start_dt, end_dt):
+                count += 1
+                yield _transform_message(message)
+
+    # Messages stream from Graph straight into the file, so write to a
+    # sibling path and only replace the real export once it is complete.
+    partial_path = output_path.with_name(f"{output_path.name}.part")
+    try:
+        writer(_selected(), partial_path)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    partial_path.replace(output_path)
+    return count
 
-    if output_format.lower() == "json":
-        _write_json(messages, output_path)
-    elif output_format.lower() == "csv":
-        _write_csv(messages, output_path)
-    else:
-        raise ValueError("Unsupported export format. Choose json or csv.")
 
+def export_chat(
+    client: GraphClient,
+    chat: dict,
+    start_dt,
+    end_dt,
+    *,
+    output_dir: Path,
+    output_format: str = "json",
+) -> tuple[Path, int]:
+    writer = _writer_for(output_format)
+    chat_id = _chat_id(chat)
+    output_path = _output_path(chat, start_dt, end_dt, output_dir, output_format)
+    raw_messages = client.list_chat_messages(
+        chat_id,
+        **_graph_window(start_dt, end_dt),
+        stop_condition=_stop_condition_for(start_dt),
+    )
+    message_count = _write_messages(raw_messages, start_dt, end_dt, output_path, writer)
     return output_path, message_count
+
+
+def export_chats(
+    client: GraphClient,
+    chats: Sequence[dict],
+    start_dt,
+    end_dt,
+    *,
+    output_dir: Path,
+    output_format: str = "json",
+) -> Iterator[tuple[dict, Path, int]]:
+    """Export several chats, fetching their messages concurrently.
+
+    Results are yielded as each chat finishes downloading and its export is
+    written, which is not necessarily the order of ``chats``. A single chat
+    is streamed straight into its file, as with :func:`export_chat`.
+    """
+
+    writer = _writer_for(output_format)
+    chats_by_id = {_chat_id(chat): chat for chat in chats}
+    if len(chats_by_id) == 1:
+        # Nothing to overlap with, so stream the chat page by page into its
+        # file rather than having a worker materialise it first.
+        (chat,) = chats_by_id.values()
+        output_path, message_count = export_chat(
+            client,
+            chat,
+            start_dt,
+            end_dt,
+            output_dir=output_dir,
+            output_format=output_format,
+        )
+        yield chat, output_path, message_count
+        return
+
+    fetched = client.list_many_chats_messages(
+        list(chats_by_id),
+        **_graph_window(start_dt, end_dt),
+        stop_condition=_stop_condition_for(start_dt),
+    )
+    for chat_id, raw_messages in fetched:
+        chat = chats_by_id[chat_id]
+        output_path = _output_path(chat, start_dt, end_dt, output_dir, output_format)
+        message_count = _write_messages(raw_messages, start_dt, end_dt, output_path, writer)
+        yield chat, output_path, message_count
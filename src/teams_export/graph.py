@@ -1,28 +1,268 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from urllib.parse import quote, urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # Optional: noticeably faster parsing of large message pages.
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
 
 GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
 DEFAULT_TIMEOUT = 60
+# Each worker thread talks to a single Graph host, so one pooled keep-alive
+# connection per thread is enough for sequential pagination.
+POOL_CONNECTIONS = 1
+POOL_MAXSIZE = 1
+# Graph throttles Teams chat reads aggressively; a handful of concurrent
+# chats is where additional workers stop paying off.
+DEFAULT_MAX_WORKERS = 4
+MAX_RETRIES = 4
+INITIAL_RETRY_DELAY = 2
+MAX_RETRY_DELAY = 30
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Graph's JSON $batch endpoint accepts at most 20 requests per call.
+BATCH_LIMIT = 20
+# Consecutive 5xx/network failures before requests fail fast, and how long
+# to wait before letting a single probe request through again.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30
 
 
 class GraphError(RuntimeError):
     """Raised when the Graph API returns an error."""
 
 
+def _retry_after(headers: Mapping[str, str]) -> float | None:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_DELAY)
+    except ValueError:
+        return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    # Jitter spreads out workers that were throttled together so their
+    # retries do not arrive at Graph in lockstep and trip the limit again.
+    delay = INITIAL_RETRY_DELAY * (2 ** attempt) * (0.5 + random.random())
+    return min(delay, MAX_RETRY_DELAY)
+
+
+class _CircuitBreaker:
+    """Fail fast while Graph keeps failing, probing again after a cool-down.
+
+    Shared by every worker of a client so that one outage does not make each
+    chat sit through its own full retry schedule.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_started: float | None = None
+        self._state_changed = threading.Condition()
+
+    def before_request(self, *, retrying: bool = False) -> bool:
+        """Wait or fail while the circuit is open; return whether to probe.
+
+        New requests fail fast during the cool-down. Requests that are already
+        retrying sit it out instead, since they may well succeed afterwards.
+        """
+
+        with self._state_changed:
+            while self._opened_at is not None:
+                now = time.monotonic()
+                remaining = self._opened_at + self._reset_timeout - now
+                if remaining > 0:
+                    if not retrying:
+                        raise GraphError(
+                            "Graph API unavailable after"
+                            f" {self._failures} consecutive failures; try again later."
+                        )
+                    self._state_changed.wait(remaining)
+                    continue
+                # Half-open: let exactly one request through as a probe. A probe
+                # that has not reported back within a request timeout is
+                # treated as lost so waiting workers cannot hang on it.
+                if self._probe_started is None or now - self._probe_started >= DEFAULT_TIMEOUT:
+                    self._probe_started = now
+                    return True
+                # Another worker is probing; its outcome decides for us too.
+                self._state_changed.wait(self._probe_started + DEFAULT_TIMEOUT - now)
+            return False
+
+    def record_success(self) -> None:
+        with self._state_changed:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+            self._state_changed.notify_all()
+
+    def record_failure(self, *, probe: bool = False) -> None:
+        with self._state_changed:
+            self._failures += 1
+            if probe:
+                self._probe_started = None
+                self._opened_at = time.monotonic()
+            elif self._opened_at is None and self._failures >= self._threshold:
+                self._opened_at = time.monotonic()
+            # Otherwise the circuit is already open and this request started
+            # before it did; its failure must not extend the cool-down.
+            self._state_changed.notify_all()
+
+
+def _message_params(start_iso: str | None, end_iso: str | None) -> Dict[str, str]:
+    params = {
+        "$top": "50",
+    }
+    clauses = []
+    if start_iso:
+        clauses.append(f"lastModifiedDateTime gt {start_iso}")
+    if end_iso:
+        clauses.append(f"lastModifiedDateTime lt {end_iso}")
+    if clauses:
+        params["$orderby"] = "lastModifiedDateTime desc"
+        params["$filter"] = " and ".join(clauses)
+    return params
+
+
+def _describe_error(status: int, detail) -> str:
+    base = detail.get("error") if isinstance(detail, dict) else detail
+    if isinstance(base, dict):
+        message = base.get("message")
+        code = base.get("code")
+        return f"Graph API error {code or status}: {message}"
+    return f"Graph API error {status}: {base}"
+
+
+def _json(response: requests.Response):
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 class GraphClient:
-    def __init__(self, token: str, base_url: str = GRAPH_BASE_URL) -> None:
-        self._session = requests.Session()
-        self._session.headers.update(
-            {
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-            }
-        )
+    def __init__(
+        self,
+        token: str,
+        base_url: str = GRAPH_BASE_URL,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> None:
+        self._headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
         self._base_url = base_url.rstrip("/")
+        self._max_workers = max(1, max_workers)
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._prefetcher: ThreadPoolExecutor | None = None
+        self._breaker = _CircuitBreaker()
+
+    @property
+    def _session(self) -> requests.Session:
+        # requests.Session is not safe to share between threads, so every
+        # worker thread lazily gets its own.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE),
+            )
+            session.headers.update(self._headers)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _request_with_retry(
+        self,
+        url: str,
+        params: Dict[str, str] | None = None,
+        *,
+        method: str = "GET",
+        json_body: dict | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> requests.Response:
+        """Send a request, backing off on throttling and transient server errors.
+
+        Setting ``cancelled`` cuts a pending retry wait short with a ``GraphError``.
+        """
+
+        attempt = 0
+        while True:
+            probe = self._breaker.before_request(retrying=attempt > 0)
+            try:
+                resp = self._session.request(
+                    method, url, params=params, json=json_body, timeout=DEFAULT_TIMEOUT
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                self._breaker.record_failure(probe=probe)
+                if attempt >= MAX_RETRIES:
+                    raise
+                wait_time = _backoff_delay(attempt)
+            except requests.RequestException:
+                self._breaker.record_failure(probe=probe)
+                raise
+            else:
+                # Any non-5xx answer means Graph is up, and so does throttling:
+                # Graph sends 503 with Retry-After as well as 429 to pace clients.
+                throttled = resp.status_code == 503 and "Retry-After" in resp.headers
+                if resp.status_code >= 500 and not throttled:
+                    self._breaker.record_failure(probe=probe)
+                else:
+                    self._breaker.record_success()
+                if resp.status_code < 400:
+                    return resp
+                if resp.status_code not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                    raise GraphError(self._format_error(resp))
+                wait_time = _retry_after(resp.headers)
+                if wait_time is None:
+                    wait_time = _backoff_delay(attempt)
+            if cancelled is None:
+                time.sleep(wait_time)
+            elif cancelled.wait(wait_time):
+                raise GraphError("Request cancelled.")
+            attempt += 1
+
+    def _fetch_page(
+        self,
+        url: str,
+        params: Dict[str, str] | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> dict:
+        if cancelled is not None and cancelled.is_set():
+            raise GraphError("Request cancelled.")
+        return _json(self._request_with_retry(url, params=params, cancelled=cancelled))
+
+    def _page_executor(self) -> ThreadPoolExecutor:
+        # Shared by every paginator on this client: each one keeps at most one
+        # page in flight, so the pool size also caps concurrent Graph requests.
+        with self._sessions_lock:
+            if self._prefetcher is None:
+                self._prefetcher = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="graph-page",
+                )
+            return self._prefetcher
 
     def _paginate(
         self,
@@ -30,52 +270,200 @@ class GraphClient:
         params: Dict[str, str] | None = None,
         *,
         stop_condition: Optional[Callable[[dict], bool]] = None,
+        first_page: dict | None = None,
+        cancelled: threading.Event | None = None,
     ) -> Iterator[dict]:
-        while url:
-            resp = self._session.get(url, params=params, timeout=DEFAULT_TIMEOUT)
-            params = None  # Only include params on first request.
-            if resp.status_code >= 400:
-                raise GraphError(self._format_error(resp))
-            payload = resp.json()
-            for item in payload.get("value", []):
-                yield item
-                if stop_condition and stop_condition(item):
-                    return
-            url = payload.get("@odata.nextLink")
+        executor = self._page_executor()
+        if first_page is None:
+            # Only include params on first request; nextLink already carries them.
+            pending = executor.submit(self._fetch_page, url, params, cancelled)
+        else:
+            # Already fetched, e.g. through $batch.
+            pending = Future()
+            pending.set_result(first_page)
+        try:
+            while pending is not None:
+                payload = pending.result()
+                items = payload.get("value", [])
+                next_url = payload.get("@odata.nextLink")
+                if next_url and stop_condition and items and stop_condition(items[-1]):
+                    # Pages are ordered, so the walk ends within this page.
+                    next_url = None
+                # Request the next page before handing out this one so the
+                # round trip overlaps with whatever the caller does per item.
+                if next_url:
+                    pending = executor.submit(self._fetch_page, next_url, None, cancelled)
+                else:
+                    pending = None
+                for item in items:
+                    yield item
+                    if stop_condition and stop_condition(item):
+                        return
+        finally:
+            if pending is not None:
+                pending.cancel()
 
     def _format_error(self, response: requests.Response) -> str:
         try:
-            detail = response.json()
-        except ValueError:
+            detail = _json(response)
+        except ValueError:  # orjson.JSONDecodeError is a ValueError too.
             detail = {"error": response.text}
-        base = detail.get("error") if isinstance(detail, dict) else detail
-        if isinstance(base, dict):
-            message = base.get("message")
-            code = base.get("code")
-            return f"Graph API error {code or response.status_code}: {message}"
-        return f"Graph API error {response.status_code}: {base}"
-
-    def list_chats(self) -> List[dict]:
+        return _describe_error(response.status_code, detail)
+
+    def batch(self, urls: Sequence[str]) -> List[dict]:
+        """GET up to ``BATCH_LIMIT`` Graph URLs in a single ``$batch`` round trip.
+
+        ``urls`` are relative to the API version root (``/me/chats/...``). Parsed
+        bodies are returned in the same order. Sub-requests that are throttled
+        or hit transient errors are retried in a follow-up batch, honouring the
+        longest ``Retry-After`` among them.
+        """
+
+        if len(urls) > BATCH_LIMIT:
+            raise ValueError(f"Graph accepts at most {BATCH_LIMIT} requests per batch.")
+        results: Dict[int, dict] = {}
+        pending = dict(enumerate(urls))
+        attempt = 0
+        while pending:
+            body = {
+                "requests": [
+                    {"id": str(index), "method": "GET", "url": url}
+                    for index, url in pending.items()
+                ]
+            }
+            resp = self._request_with_retry(
+                f"{self._base_url}/$batch", method="POST", json_body=body
+            )
+            waits: List[float] = []
+            for response in _json(resp).get("responses", []):
+                index = int(response["id"])
+                status = int(response.get("status", 500))
+                if status < 400:
+                    results[index] = response.get("body") or {}
+                    pending.pop(index, None)
+                elif status not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                    raise GraphError(_describe_error(status, response.get("body")))
+                else:
+                    wait_time = _retry_after(response.get("headers") or {})
+                    waits.append(_backoff_delay(attempt) if wait_time is None else wait_time)
+            if pending:
+                if attempt >= MAX_RETRIES:
+                    raise GraphError("Graph $batch response omitted some requests.")
+                time.sleep(max(waits, default=_backoff_delay(attempt)))
+                attempt += 1
+        return [results[index] for index in range(len(urls))]
+
+    def list_chats(self, *, expand_members: bool = True) -> Iterator[dict]:
+        """Yield the signed-in user's chats.
+
+        Expanding members makes Graph resolve every chat's membership, which
+        inflates the response considerably; pass ``expand_members=False`` when
+        only chat ids and topics are needed.
+        """
+
         url = f"{self._base_url}/me/chats"
-        params = {
-            "$expand": "members",
-        }
-        return list(self._paginate(url, params=params))
+        params = {"$expand": "members"} if expand_members else {"$top": "50"}
+        return self._paginate(url, params=params)
 
     def list_chat_messages(
         self,
         chat_id: str,
         *,
+        start_iso: str | None = None,
+        end_iso: str | None = None,
         stop_condition: Optional[Callable[[dict], bool]] = None,
-    ) -> List[dict]:
+    ) -> Iterator[dict]:
+        """Yield chat messages page by page as Graph returns them.
+
+        ``start_iso``/``end_iso`` are sent as an exclusive ``lastModifiedDateTime``
+        filter so Graph only pages through that window; it supports ``gt``/``lt``
+        there, and only together with the matching ``$orderby``.
+        """
+
         url = f"{self._base_url}/me/chats/{chat_id}/messages"
-        params = {
-            "$top": "50",
-        }
-        return list(self._paginate(url, params=params, stop_condition=stop_condition))
+        params = _message_params(start_iso, end_iso)
+        return self._paginate(url, params=params, stop_condition=stop_condition)
+
+    def list_many_chats_messages(
+        self,
+        chat_ids: Iterable[str],
+        *,
+        start_iso: str | None = None,
+        end_iso: str | None = None,
+        stop_condition: Optional[Callable[[dict], bool]] = None,
+    ) -> Iterator[tuple[str, List[dict]]]:
+        """Fetch messages for several chats concurrently.
+
+        ``(chat_id, messages)`` pairs are yielded as each chat finishes, so one
+        slow chat does not hold back results that are already available.
+        Unlike :meth:`list_chat_messages`, each chat is fully materialised by its
+        worker so the network round trips overlap across chats.
+        """
+
+        params = _message_params(start_iso, end_iso)
+        query = urlencode(params, quote_via=quote, safe="$")
+
+        # Set once the caller is done with us, so chats that are already being
+        # paged stop at their next request instead of downloading to the end.
+        cancelled = threading.Event()
+
+        def _fetch(chat_id: str, first_page: dict | None) -> List[dict]:
+            messages = self._paginate(
+                f"{self._base_url}/me/chats/{chat_id}/messages",
+                params=params,
+                stop_condition=stop_condition,
+                first_page=first_page,
+                cancelled=cancelled,
+            )
+            return list(messages)
+
+        if not isinstance(chat_ids, list):
+            chat_ids = list(chat_ids)
+        if not chat_ids:
+            return
+        executor = ThreadPoolExecutor(max_workers=min(self._max_workers, len(chat_ids)))
+        futures: Dict[Future, str] = {}
+
+        def _finished(block: bool) -> Iterator[tuple[str, List[dict]]]:
+            done, _ = wait(futures, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield futures.pop(future), future.result()
+
+        try:
+            for offset in range(0, len(chat_ids), BATCH_LIMIT):
+                # Hand out finished chats before fetching more first pages, and
+                # only fetch the next group once the queued chats have all been
+                # picked up, so results stream out and few pages sit in memory.
+                yield from _finished(block=False)
+                while len(futures) > self._max_workers:
+                    yield from _finished(block=True)
+                group = chat_ids[offset : offset + BATCH_LIMIT]
+                # One $batch round trip fetches the first page of up to 20 chats;
+                # workers then follow each chat's nextLink on their own.
+                if len(group) > 1:
+                    first_pages = self.batch(
+                        [f"/me/chats/{chat_id}/messages?{query}" for chat_id in group]
+                    )
+                else:
+                    first_pages = [None]
+                for chat_id, first_page in zip(group, first_pages):
+                    futures[executor.submit(_fetch, chat_id, first_page)] = chat_id
+            while futures:
+                yield from _finished(block=True)
+        finally:
+            # Do not start chats that are still queued if the caller stopped early
+            # or one of the fetches failed, and stop the ones in progress.
+            cancelled.set()
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def close(self) -> None:
-        self._session.close()
+        with self._sessions_lock:
+            executor, self._prefetcher = self._prefetcher, None
+            sessions, self._sessions = self._sessions, []
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for session in sessions:
+            session.close()
 
     def __enter__(self) -> "GraphClient":
         return self